@@ -1,7 +1,9 @@
 import sys
 import os
-from datetime import datetime
-from typing import Union, TextIO
+import errno
+import threading
+import time
+from typing import Optional, Union, TextIO
 from pathlib import Path
 
 
@@ -19,51 +21,149 @@ class LogClosedError(Exception):
         )
 
 
-class DualOutput:
+class PlainTee:
     """
     Helper class to duplicate output to both a file and the console.
 
+    Writes are passed straight through to both sinks; coalescing small
+    writes is left to the log file's own buffer, which both the stdout
+    and stderr wrappers share so their output stays in order.
+
     Parameters
     ----------
     file : TextIO
         The file-like object (log file) to write to.
     stream : TextIO
-        The original stream (usually sys.stdout or sys.stderr).
-    is_stdout : bool, optional
-        If True, this stream is stdout and we may add timestamps
-        when printing. If False, this is stderr with no timestamps.
+        The original stream (usually sys.stderr).
+    flush_each : bool, optional
+        If True, flush the log file after every write so it can be tailed
+        live. If False (default), rely on the file's own buffering.
+    stdout_tee : TimestampingTee, optional
+        The tee redirecting stdout to the same file. If given, a stdout line
+        still open in the log is stamped and ended before each write, so
+        stderr output starts on its own line.
     """
 
-    def __init__(self, file: TextIO, stream: TextIO, is_stdout: bool = True):
+    def __init__(
+        self,
+        file: TextIO,
+        stream: TextIO,
+        flush_each: bool = False,
+        stdout_tee: Optional["TimestampingTee"] = None,
+    ):
         self.file = file
         self.stream = stream
-        self.is_stdout = is_stdout
+        self.flush_each = flush_each
+        # Bound methods, to skip attribute lookups on every write
+        self._stream_write = stream.write
+        self._file_write = file.write
+        self._stream_flush = stream.flush
+        self._file_flush = file.flush
+        self._end_stdout_line = (
+            stdout_tee.flush_pending_timestamp if stdout_tee is not None else None
+        )
+
+    def write(self, message: str) -> None:
+        """
+        Write a message unmodified to both the console and the log file.
+        """
+        if self._end_stdout_line is not None:
+            self._end_stdout_line()
+        self._stream_write(message)
+        self._file_write(message)
+        if self.flush_each:
+            self._file_flush()
+
+    def flush(self) -> None:
+        """
+        Flush both the console stream and the file buffer.
+        """
+        self._stream_flush()
+        self._file_flush()
+
+
+class TimestampingTee(PlainTee):
+    """
+    Same as `PlainTee`, but every line of output written to the log file is
+    followed by a timestamp. Used for stdout.
+
+    The timestamp is emitted once per logical statement: after the first
+    write ending in a newline that follows non-whitespace output, so a
+    `print` call made of several writes gets a single timestamp.
+    """
+
+    def __init__(self, file: TextIO, stream: TextIO, flush_each: bool = False):
+        super().__init__(file, stream, flush_each)
+        # Formatted timestamp cached for the second it was built in
+        self._last_ts_sec = None
+        self._last_ts_str = ""
+        # True once non-whitespace output awaits its timestamp
+        self._ts_pending = False
+
+    def _timestamp(self) -> str:
+        """
+        Return the timestamp line appended to stdout messages, formatting
+        it only when the current second has changed.
+        """
+        sec = int(time.time())
+        if sec != self._last_ts_sec:
+            self._last_ts_sec = sec
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+            self._last_ts_str = "[" + stamp + "]\n\n"
+        return self._last_ts_str
+
+    def flush_pending_timestamp(self) -> None:
+        """
+        End a stdout line left unterminated (e.g. `print(..., end="")`) in
+        the log file and write its timestamp, before other output (stderr or
+        a status message) is written after it.
+        """
+        if self._ts_pending:
+            self._ts_pending = False
+            # Drop the trailing blank line; the next output follows directly
+            self._file_write("\n" + self._timestamp()[:-1])
 
     def write(self, message: str) -> None:
         """
         Write a message to both the console and the log file.
 
-        If this is stdout and the message is non-empty, append a
-        timestamp right after the message.
+        If the message ends a line of non-whitespace output, append a
+        timestamp right after it in the log file.
         """
-        if self.is_stdout and message.strip():
-            timestamp = f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}]\n"
-            formatted_message = message + timestamp
+        # Write unmodified to the console
+        self._stream_write(message)
+
+        if message == "\n":
+            # Fast path for the bare newline that ends every print() call
+            if self._ts_pending:
+                self._ts_pending = False
+                message = "\n" + self._timestamp()
         else:
-            formatted_message = message
+            if not self._ts_pending and message and not message.isspace():
+                self._ts_pending = True
+            if self._ts_pending and message.endswith("\n"):
+                self._ts_pending = False
+                message = message + self._timestamp()
 
-        # Write unmodified to the console
-        self.stream.write(message)
         # Write to the file (with potential timestamp insertion)
-        self.file.write(formatted_message)
-        self.file.flush()
+        self._file_write(message)
+        if self.flush_each:
+            self._file_flush()
 
-    def flush(self) -> None:
-        """
-        Flush both the console stream and the file buffer.
-        """
-        self.stream.flush()
-        self.file.flush()
+
+# Default size (in bytes) of the log file buffer
+DEFAULT_BUFFER_SIZE = 1 << 17
+
+# fsync errors meaning the log target (/dev/null, a pipe, a tty...) cannot
+# be synced, as opposed to the data failing to reach the disk
+_UNSYNCABLE_ERRNOS = frozenset(
+    (errno.EINVAL, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EBADF)
+)
+
+# Logger states: file closed, open but paused, open and redirecting output
+_CLOSED = 0
+_PAUSED = 1
+_ACTIVE = 2
 
 
 class BPLIMLogger:
@@ -82,10 +182,36 @@ class BPLIMLogger:
       3. Call `close()` to fully close the log file and restore stdout/stderr.
     """
 
+    __slots__ = (
+        "_log_file",
+        "_abs_log_file",
+        "_banner_template",
+        "_append",
+        "_flush_each",
+        "_buffer_size",
+        "_state",
+        "_original_stdout",
+        "_original_stderr",
+        "_current_log",
+        "_stdout_tee",
+        "__weakref__",
+    )
+
     _active_logger = None
     _active_logger_path = None
-
-    def __init__(self, log_file: Union[Path, str], append: bool = False):
+    # Guards checking and claiming/freeing the active logger slot
+    _claim_lock = threading.Lock()
+
+    # Separator line framing the status messages
+    _SEP = "-" * 130
+
+    def __init__(
+        self,
+        log_file: Union[Path, str],
+        append: bool = False,
+        flush_each: bool = False,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ):
         """
         Prepare a logger instance with a log file path and append mode.
         Does not open or redirect output yet; call `init()` for that.
@@ -96,32 +222,58 @@ class BPLIMLogger:
             Path to the log file.
         append : bool, optional
             If True, opens the log file in append mode. Otherwise, overwrites.
+        flush_each : bool, optional
+            If True, the log file is line buffered and flushed after every
+            write, so it can be followed live (e.g. with `tail -f`). If False
+            (default), output is block buffered and flushed on status
+            messages and on `close()`.
+        buffer_size : int, optional
+            Size in bytes of the log file buffer when `flush_each` is False.
+            Must be at least 2; defaults to 128 KiB. Buffered output is
+            flushed on `close()`.
 
         Raises
         ------
+        ValueError
+            If `buffer_size` is smaller than 2.
         LogOpenedError
-            If another logger is already active and not closed.
+            If another logger holds the active slot (it has not been closed).
         """
-        # Check if there's already an active logger
-        if (
-            BPLIMLogger._active_logger is not None
-            and not BPLIMLogger._active_logger._is_closed
-        ):
-            raise LogOpenedError(BPLIMLogger._active_logger_path)
+        # open() treats 0 as unbuffered (invalid for text) and 1 as line buffered
+        if buffer_size < 2:
+            raise ValueError(
+                f"buffer_size must be at least 2 bytes, got {buffer_size}."
+            )
 
         self._log_file = log_file
+        self._abs_log_file = os.path.abspath(log_file)
+        # Status message template; braces in the path are escaped for format()
+        escaped_path = self._abs_log_file.replace("{", "{{").replace("}", "}}")
+        self._banner_template = (
+            "\n" + self._SEP + "\n"
+            "{prefix_log}log:  " + escaped_path + "\n"
+            "{prefix_action} on:  {when}\n" + self._SEP + "\n\n"
+        )
         self._append = append
-        self._is_closed = True  # starts off closed; init() will open
-        self._is_on = False  # only "on" once streams are redirected
+        self._flush_each = flush_each
+        self._buffer_size = buffer_size
+        # Starts off closed; init() opens the file and redirects streams
+        self._state = _CLOSED
 
         # Keep references to original I/O so we can restore them later
         self._original_stdout = sys.stdout
         self._original_stderr = sys.stderr
         self._current_log = None
+        self._stdout_tee = None
+
+        with BPLIMLogger._claim_lock:
+            # Check if there's already an active logger, initialized or not
+            if BPLIMLogger._active_logger is not None:
+                raise LogOpenedError(BPLIMLogger._active_logger_path)
 
-        # Claim the active logger slot; track which file is about to be used
-        BPLIMLogger._active_logger = self
-        BPLIMLogger._active_logger_path = os.path.abspath(self._log_file)
+            # Claim the active logger slot; track which file is about to be used
+            BPLIMLogger._active_logger = self
+            BPLIMLogger._active_logger_path = self._abs_log_file
 
     def __repr__(self) -> str:
         """Returns the object's representation"""
@@ -130,7 +282,7 @@ class BPLIMLogger:
     @property
     def log_file(self) -> str:
         """Returns the absolute path of the log file."""
-        return os.path.abspath(self._log_file)
+        return self._abs_log_file
 
     def _build_status_message(self, action: str) -> str:
         """
@@ -161,12 +313,10 @@ class BPLIMLogger:
         prefix_log = " " * base_indent
         prefix_action = " " + action  # e.g., " resumed" or " opened"
 
-        return (
-            f"\n{'-' * 130}\n"
-            f"{prefix_log}log:  {os.path.abspath(self._log_file)}\n"
-            f"{prefix_action} on:  {datetime.now().strftime('%d %b %Y, %H:%M:%S')}\n"
-            + "-" * 130
-            + "\n\n"
+        return self._banner_template.format(
+            prefix_log=prefix_log,
+            prefix_action=prefix_action,
+            when=time.strftime("%d %b %Y, %H:%M:%S"),
         )
 
     def _write_status(self, message: str) -> None:
@@ -174,28 +324,52 @@ class BPLIMLogger:
         Writes a status message to both the log file (if open) and the
         original stdout.
 
+        The log file is flushed and the message is then written straight to
+        its file descriptor, so it reaches the OS before any further output.
+
         Parameters
         ----------
         message : str
             The status message to log.
         """
+        # Emit anything still pending on stderr before the banner
+        self._original_stderr.flush()
+        if self._stdout_tee is not None:
+            # Stamp a stdout line the banner is about to interrupt
+            self._stdout_tee.flush_pending_timestamp()
         if self._current_log:
-            self._current_log.write(message)
-            self._current_log.flush()
+            log = self._current_log
+            log.flush()
+            # Match the newline translation of the text-mode log file
+            data = memoryview(message.replace("\n", os.linesep).encode(log.encoding))
+            fd = log.fileno()
+            # os.write may write only part of the data (full disk, pipes)
+            while data:
+                data = data[os.write(fd, data):]
         self._original_stdout.write(message)
         self._original_stdout.flush()
 
     def _redirect_streams(self) -> None:
         """
-        Redirects sys.stdout and sys.stderr to the open log file via DualOutput.
+        Redirects sys.stdout and sys.stderr to the open log file, through a
+        TimestampingTee and a PlainTee respectively.
         """
-        sys.stdout = DualOutput(self._current_log, self._original_stdout, True)
-        sys.stderr = DualOutput(self._current_log, self._original_stderr, False)
+        self._stdout_tee = TimestampingTee(
+            self._current_log, self._original_stdout, self._flush_each
+        )
+        sys.stdout = self._stdout_tee
+        sys.stderr = PlainTee(
+            self._current_log,
+            self._original_stderr,
+            self._flush_each,
+            self._stdout_tee,
+        )
 
     def _restore_streams(self) -> None:
         """
         Restores the original sys.stdout and sys.stderr streams.
         """
+        self._stdout_tee = None
         sys.stdout = self._original_stdout
         sys.stderr = self._original_stderr
 
@@ -209,27 +383,28 @@ class BPLIMLogger:
         Exception
             If the logger has already been initialized.
         """
-        if not self._is_closed:
+        if self._state != _CLOSED:
             raise Exception("BPLIMLogger: This logger has already been initialized.")
 
         mode = "a" if self._append else "w"
-        self._current_log = open(self._log_file, mode)
+        buffering = 1 if self._flush_each else self._buffer_size
+        self._current_log = open(self._abs_log_file, mode, buffering=buffering)
 
         message = self._build_status_message("opened")
         self._write_status(message)
 
         self._redirect_streams()
 
-        self._is_closed = False
-        self._is_on = True
+        self._state = _ACTIVE
 
     def on(self) -> None:
         """
         Resumes redirection of output to the log file if it has been paused.
         """
-        if self._is_closed:
+        state = self._state
+        if state == _CLOSED:
             raise LogClosedError("on")
-        if self._is_on:
+        if state == _ACTIVE:
             print("Log file already on")
             return
 
@@ -237,15 +412,16 @@ class BPLIMLogger:
         self._write_status(message)
 
         self._redirect_streams()
-        self._is_on = True
+        self._state = _ACTIVE
 
     def off(self) -> None:
         """
         Pauses redirection of output to the log file without closing the file.
         """
-        if self._is_closed:
+        state = self._state
+        if state == _CLOSED:
             raise LogClosedError("off")
-        if not self._is_on:
+        if state == _PAUSED:
             print("Log file already off")
             return
 
@@ -253,29 +429,56 @@ class BPLIMLogger:
         self._write_status(message)
 
         self._restore_streams()
-        self._is_on = False
+        self._state = _PAUSED
 
     def close(self) -> None:
         """
         Closes the log file fully and restores original stdout/stderr.
         Once closed, this logger can no longer be used to log output.
 
+        The log file is synced to disk before closing. This is the only point
+        where durability is guaranteed; output written while the log is open
+        may still be lost if the process or machine crashes.
+
         If this logger is the currently active logger, frees up the slot
-        so a new BPLIMLogger can be created.
+        so a new BPLIMLogger can be created. This also applies to a logger
+        that was never initialized.
+
+        Raises
+        ------
+        OSError
+            If the log file could not be synced to disk (e.g. disk full or
+            I/O error). The logger is still closed and its slot freed.
         """
-        if self._is_closed:
+        if self._state == _CLOSED:
+            self._release_slot()
             return
 
         message = self._build_status_message("closed")
-        self._write_status(message)
-
-        self._current_log.close()
-        self._current_log = None
-        self._restore_streams()
-
-        self._is_closed = True
-        self._is_on = False
-
-        if BPLIMLogger._active_logger is self:
-            BPLIMLogger._active_logger = None
-            BPLIMLogger._active_logger_path = None
+        try:
+            self._write_status(message)
+            # _write_status left nothing buffered, so sync straight away
+            try:
+                os.fsync(self._current_log.fileno())
+            except OSError as e:
+                if e.errno not in _UNSYNCABLE_ERRNOS:
+                    raise
+        finally:
+            # Always release the file, the streams and the slot
+            try:
+                self._current_log.close()
+            finally:
+                self._current_log = None
+                self._restore_streams()
+
+                self._state = _CLOSED
+                self._release_slot()
+
+    def _release_slot(self) -> None:
+        """
+        Frees the active logger slot if this logger holds it.
+        """
+        with BPLIMLogger._claim_lock:
+            if BPLIMLogger._active_logger is self:
+                BPLIMLogger._active_logger = None
+                BPLIMLogger._active_logger_path = None
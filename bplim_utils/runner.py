@@ -1,7 +1,39 @@
 import os
-import inspect
+import sys
 from pathlib import Path
-from typing import Union
+from types import CodeType
+from typing import Dict, Tuple, Union
+
+
+# Compiled scripts keyed by absolute path, stored with the (mtime in ns,
+# size in bytes) of the file they were compiled from
+_CODE_CACHE: Dict[str, Tuple[Tuple[int, int], CodeType]] = {}
+
+# Marks globals that were not set before running a script
+_MISSING = object()
+
+
+def _compile_script(script_path: str) -> CodeType:
+    """
+    Returns the compiled code object for a script, reusing a cached
+    one if the file has not changed since it was last compiled.
+
+    Args:
+        script_path (str): Absolute path to the script.
+    """
+    st = os.stat(script_path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _CODE_CACHE.get(script_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    # compile() decodes the source itself, honouring any coding cookie
+    with open(script_path, "rb") as f:
+        script_bytes = f.read()
+
+    code_obj = compile(script_bytes, script_path, "exec")
+    _CODE_CACHE[script_path] = (stamp, code_obj)
+    return code_obj
 
 
 def run_script(script_path: Union[Path, str]) -> None:
@@ -18,19 +50,23 @@ def run_script(script_path: Union[Path, str]) -> None:
     Args:
         script_path (Union[Path, str]): Path to the script to run.
     """
-    script_path = os.path.abspath(script_path)
-
-    with open(script_path, "r", encoding="utf-8") as f:
-        script_content = f.read()
+    script_path = os.fspath(script_path)
+    # abspath queries the OS on Windows even for paths that are already absolute
+    if os.path.isabs(script_path):
+        script_path = os.path.normpath(script_path)
+    else:
+        script_path = os.path.abspath(script_path)
 
-    code_obj = compile(script_content, script_path, "exec")
+    code_obj = _compile_script(script_path)
 
     # Get the caller's global scope
-    caller_globals = inspect.currentframe().f_back.f_globals
+    caller_globals = sys._getframe(1).f_globals
 
     # Save and temporarily override __file__ and __name__
-    old_file = caller_globals.get("__file__")
-    old_name = caller_globals.get("__name__")
+    saved = {
+        "__file__": caller_globals.get("__file__", _MISSING),
+        "__name__": caller_globals.get("__name__", _MISSING),
+    }
 
     caller_globals["__file__"] = script_path
     caller_globals["__name__"] = "__main__"
@@ -39,12 +75,8 @@ def run_script(script_path: Union[Path, str]) -> None:
         exec(code_obj, caller_globals)
     finally:
         # Restore original values
-        if old_file is not None:
-            caller_globals["__file__"] = old_file
-        else:
-            caller_globals.pop("__file__", None)
-
-        if old_name is not None:
-            caller_globals["__name__"] = old_name
-        else:
-            caller_globals.pop("__name__", None)
+        for key, value in saved.items():
+            if value is _MISSING:
+                caller_globals.pop(key, None)
+            else:
+                caller_globals[key] = value